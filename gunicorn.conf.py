@@ -0,0 +1,94 @@
+"""
+Gunicorn Configuration - PranAIR Medical Drone Backend
+======================================================
+Runs main:app under Gunicorn's process supervision (watchdog, preloaded
+model, graceful restarts) with Uvicorn workers.
+
+Defaults to ONE worker: the drone state is per-process memory
+(DRONE_TELEMETRY's mission and status set by /optimize-route, the
+telemetry simulation and the caption cache), so with several workers
+/drone-status would answer differently depending on which worker a poll
+lands on. Raise WEB_CONCURRENCY only for deployments that don't rely on
+that state; main.py divides BLIP's threads between the workers.
+
+The app is preloaded once in the master process and BLIP is loaded there
+before forking. PyTorch weights are then shared copy-on-write by the
+workers; ONNX Runtime sessions don't survive fork(), so with the INT8
+backend each worker opens its own session and the master only does the
+one-time export/quantization.
+
+Fork constraint: no native thread pool may start in the master, or the
+forked workers inherit a pool whose threads don't exist and hang (in
+their first parallel call, or in sys.exit() on every graceful stop):
+- ONNX Runtime sessions: released in when_ready, opened in post_fork
+- PyTorch's OpenMP intra-op pool: the master loads BLIP with one thread
+  (when_ready); inference and the warmup run only in the workers
+- Numba's parallel=True kernels: quantum_route_optimizer only warms its
+  serial kernel at import; the parallel one first runs in a worker
+
+Usage:
+    gunicorn main:app -c gunicorn.conf.py
+"""
+
+import os
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))  # See the module docstring
+
+# Load BLIP once before forking instead of once per worker (~1 GB each).
+# Everything imported or loaded in the master must leave native thread
+# pools unstarted - see the fork constraint in the module docstring
+preload_app = True
+
+# Heartbeat files on tmpfs so a busy disk can't make workers look hung
+worker_tmp_dir = "/dev/shm"
+
+# BLIP warmup and long batched inferences must not trip the worker watchdog
+timeout = 120
+
+# Keep polling clients' connections open between requests (timeout_keep_alive)
+keepalive = 30
+
+
+def when_ready(server):
+    """
+    Loads BLIP in the master so forked workers inherit it (PyTorch) or at
+    least find the exported INT8 model on disk (ONNX Runtime).
+    
+    Loading runs with OMP_NUM_THREADS=1 so the weight conversions don't
+    start PyTorch's OpenMP pool in the master; post_fork restores the
+    thread count in each worker.
+    """
+    import main
+    
+    omp_threads = os.environ.get("OMP_NUM_THREADS")
+    os.environ["OMP_NUM_THREADS"] = "1"  # Read once, when torch is first imported
+    try:
+        main.load_blip_model()
+    finally:
+        if omp_threads is None:
+            os.environ.pop("OMP_NUM_THREADS")
+        else:
+            os.environ["OMP_NUM_THREADS"] = omp_threads
+    if main.BLIP_BACKEND == "ONNX-INT8":
+        # Unusable after fork (see post_fork): don't hold it in the master
+        main.ort_model = None
+
+
+def post_fork(server, worker):
+    """
+    Starts the native runtimes that must not exist before the fork (see
+    the module docstring) in each worker.
+    
+    ORT sessions own native thread pools that do not survive fork(), so a
+    session created in the master would hang in the children. PyTorch's
+    weights are shared as loaded, but its intra-op thread count is set
+    here, after the fork, so the OpenMP pool starts in the worker.
+    """
+    import main
+    
+    if main.BLIP_BACKEND == "ONNX-INT8":
+        main.ort_model = main.load_blip_onnx_int8()
+    elif main.BLIP_BACKEND == "PYTORCH":
+        main.torch.set_num_threads(main.BLIP_NUM_THREADS)
@@ -21,7 +21,6 @@ import logging
 import json
 import traceback
 import base64
-import io
 import asyncio
 import edge_tts
 
@@ -53,6 +52,17 @@ except Exception as e:
     logger.error(f"Failed to initialize model {MODEL_NAME}: {e}")
     model = None
 
+# Fixed instructions, sent as the first part of every request so the
+# prompt prefix is identical across calls; per-request vitals and camera
+# context follow in a separate part
+SYSTEM_PROMPT = """
+You are the onboard AI for the PranAIR Medical Drone. 
+Voice Tone Analysis: Listen to the user's voice urgently.
+
+Task: Speak back to the patient. Give a 2-sentence medical instruction. 
+Be calm, authoritative, and medically sound. Do not mention you are an AI.
+"""
+
 # Router
 router = APIRouter(prefix="/patient", tags=["Patient Assistant"])
 
@@ -77,16 +87,14 @@ async def text_to_speech_base64(text: str, voice: str = "en-US-AriaNeural") -> s
     """
     try:
         communicate = edge_tts.Communicate(text, voice)
-        # Create an in-memory byte stream
-        mp3_io = io.BytesIO()
+        # Accumulate MP3 chunks in place (no seek/read copy of the whole stream)
+        audio_bytes = bytearray()
         
         async for chunk in communicate.stream():
             if chunk["type"] == "audio":
-                mp3_io.write(chunk["data"])
+                audio_bytes.extend(chunk["data"])
         
-        mp3_io.seek(0)
-        audio_bytes = mp3_io.read()
-        base64_audio = base64.b64encode(audio_bytes).decode('utf-8')
+        base64_audio = base64.b64encode(audio_bytes).decode('ascii')
         return base64_audio
     except Exception as e:
         logger.error(f"TTS Generation Error: {e}")
@@ -142,17 +150,12 @@ async def voice_assistant(
         if not model:
             raise RuntimeError("Gemini Model not loaded.")
 
-        system_prompt = f"""
-You are the onboard AI for the PranAIR Medical Drone. 
-Voice Tone Analysis: Listen to the user's voice urgently.
-Vitals Analysis: {json.dumps(vitals_data)}
-Visual Context: {blip_context}
-
-Task: Speak back to the patient. Give a 2-sentence medical instruction. 
-Be calm, authoritative, and medically sound. Do not mention you are an AI.
-"""
+        patient_context = (
+            f"Vitals Analysis: {json.dumps(vitals_data)}\n"
+            f"Visual Context: {blip_context}\n"
+        )
         # Construct Multimodal inputs
-        contents = [system_prompt]
+        contents = [SYSTEM_PROMPT, patient_context]
         
         if audio_bytes:
             contents.append({
@@ -1,25 +1,26 @@
 """
 Quantum-Inspired Route Optimization Module for PranAIR Medical Drone
 ====================================================================
-Uses QUBO (Quadratic Unconstrained Binary Optimization) formulation
-to solve the Traveling Salesman Problem for optimal medical delivery routes.
+Solves the Traveling Salesman Problem for optimal medical delivery routes.
 
 Architecture:
-- Qiskit Optimization for QUBO formulation
-- Classical solver (NumPy) for stability
+- Lin-Kernighan local search (2-opt + Or-opt) as the default solver
+- Optional QUBO (Quadratic Unconstrained Binary Optimization) formulation
+  via Qiskit Optimization, solved classically (NumPy)
 - Easily upgradeable to real quantum hardware (QAOA, D-Wave)
 """
 
+import functools
+import itertools
 import logging
 import numpy as np
-import networkx as nx
 from typing import List, Optional
 from pydantic import BaseModel
 
 # Quantum Optimization imports
 OPTIMIZER_AVAILABLE = True
 try:
-    from qiskit_optimization.applications import Tsp
+    from qiskit_optimization import QuadraticProgram
     from qiskit_optimization.converters import QuadraticProgramToQubo
     from qiskit_algorithms import NumPyMinimumEigensolver
     from qiskit_optimization.algorithms import MinimumEigenOptimizer
@@ -27,9 +28,22 @@ except ImportError as e:
     OPTIMIZER_AVAILABLE = False
     logging.warning(f"Qiskit optimization not available: {e}")
 
+# Numba JIT for the distance matrix (optional - NumPy fallback)
+NUMBA_AVAILABLE = True
+try:
+    from numba import njit, prange, types
+except ImportError as e:
+    NUMBA_AVAILABLE = False
+    logging.warning(f"Numba not available (NumPy distance matrix used): {e}")
+
 # Setup logging
 logger = logging.getLogger("QuantumOptimizer")
 
+# Stateless Qiskit pipeline objects, built once instead of per request
+if OPTIMIZER_AVAILABLE:
+    QUBO_CONVERTER = QuadraticProgramToQubo()
+    QUBO_SOLVER = MinimumEigenOptimizer(NumPyMinimumEigensolver())
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -78,139 +92,538 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     
     return c * r
 
-def build_distance_matrix(locations: List[Location], use_haversine: bool = True) -> np.ndarray:
+def haversine_vector(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """
+    Vectorized haversine_distance: element-wise great circle distance (km)
+    between broadcastable arrays of points given in degrees.
+    """
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng/2)**2
+    # Clip guards sqrt/arcsin against a rounding a slightly above 1
+    c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    
+    return c * 6371
+
+if NUMBA_AVAILABLE:
+    def _haversine_matrix_py(lat: np.ndarray, lng: np.ndarray, out: np.ndarray) -> None:
+        """
+        Fills out[i, j] with the Haversine distance (km) between points i and j.
+        
+        Compiled to a SIMD loop by LLVM, with rows spread across cores in
+        the parallel build; lat/lng are in degrees.
+        """
+        n = lat.shape[0]
+        # Per-point terms once (O(n)) instead of inside the O(n^2) loop
+        rlat = np.radians(lat)
+        rlng = np.radians(lng)
+        cos_lat = np.cos(rlat)
+        # The matrix is symmetric: compute i < j and mirror, half the trig
+        for i in prange(n):
+            out[i, i] = 0.0
+            for j in range(i + 1, n):
+                dlat = rlat[j] - rlat[i]
+                dlng = rlng[j] - rlng[i]
+                a = np.sin(dlat/2)**2 + cos_lat[i] * cos_lat[j] * np.sin(dlng/2)**2
+                distance = 2 * 6371 * np.arcsin(np.sqrt(min(a, 1.0)))
+                out[i, j] = distance
+                out[j, i] = distance
+    
+    # Decorated twice from the plain function (not via .py_func, which
+    # doesn't exist under NUMBA_DISABLE_JIT=1). The serial build skips the
+    # thread pool: for small matrices waking the workers costs more than
+    # the rows they would share
+    _haversine_matrix = njit(parallel=True, fastmath=True, cache=True)(_haversine_matrix_py)
+    _haversine_matrix_serial = njit(fastmath=True, cache=True)(_haversine_matrix_py)
+    
+    # Compile the serial kernel once at import (and persist via cache=True)
+    # instead of on the first route request. The parallel kernel is NOT
+    # called here: its first call starts Numba's native thread pool, and a
+    # pool started in the Gunicorn master (preload_app) leaves every forked
+    # worker hanging at exit. cache=True still saves its compile from the
+    # first large route onwards.
+    _haversine_matrix_serial(np.zeros(2), np.zeros(2), np.empty((2, 2), dtype=np.float32))
+
+PARALLEL_MATRIX_MIN_NODES = 32  # Below this the matrix is built on one thread
+
+def to_soa(locations: List[Location]) -> np.ndarray:
+    """
+    Converts a list of Location models into one contiguous coordinate
+    buffer (struct-of-arrays), read once so downstream math never touches
+    per-object attributes.
+    
+    Returns:
+        (2, N) float64 array in degrees, in input order: row 0 holds the
+        latitudes and row 1 the longitudes, so `lats, lngs = to_soa(...)`
+        unpacks into two contiguous views of the same allocation
+    """
+    count = len(locations)
+    coords = np.empty((2, count), dtype=np.float64)
+    coords[0] = np.fromiter((loc.lat for loc in locations), dtype=np.float64, count=count)
+    coords[1] = np.fromiter((loc.lng for loc in locations), dtype=np.float64, count=count)
+    return coords
+
+DISTANCE_CACHE_SIZE = 256  # Distinct waypoint sets whose matrices are kept
+# Larger routes are computed but not cached: at 4 bytes per entry this caps
+# one entry at 256 KB and the whole cache at 64 MB
+DISTANCE_CACHE_MAX_NODES = 256
+COORD_DECIMALS = 6  # ~0.1 m: coordinates closer than this share a cache entry
+
+def _compute_distance_matrix(lats: np.ndarray, lngs: np.ndarray, use_haversine: bool) -> np.ndarray:
+    """
+    Computes the NxN distance matrix (no caching, see build_distance_matrix).
+    """
+    # Numba kernel if available, else one vectorized NumPy pass over all
+    # pairs - never an N^2 Python loop
+    if use_haversine and NUMBA_AVAILABLE:
+        adj_matrix = np.empty((len(lats), len(lats)), dtype=np.float32)
+        if len(lats) >= PARALLEL_MATRIX_MIN_NODES:
+            _haversine_matrix(lats, lngs, adj_matrix)
+        else:
+            _haversine_matrix_serial(lats, lngs, adj_matrix)
+        return adj_matrix
+    
+    if use_haversine:
+        # Column vs row broadcasting gives every pair in one call
+        adj_matrix = haversine_vector(lats[:, None], lngs[:, None], lats[None, :], lngs[None, :])
+    else:
+        # Euclidean approximation (faster but less accurate)
+        adj_matrix = np.hypot(lats[:, None] - lats[None, :], lngs[:, None] - lngs[None, :])
+    
+    np.fill_diagonal(adj_matrix, 0.0)
+    
+    return adj_matrix.astype(np.float32, copy=False)
+
+@functools.lru_cache(maxsize=DISTANCE_CACHE_SIZE)
+def _cached_distance_matrix(coords_key: bytes, use_haversine: bool) -> np.ndarray:
+    """
+    Distance matrix for the quantized (2, N) coordinate buffer in coords_key,
+    shared read-only between all callers that hit the same entry.
+    """
+    lats, lngs = np.frombuffer(coords_key).reshape(2, -1).copy()
+    adj_matrix = _compute_distance_matrix(lats, lngs, use_haversine)
+    adj_matrix.setflags(write=False)
+    return adj_matrix
+
+def build_distance_matrix(lats: np.ndarray, lngs: np.ndarray, use_haversine: bool = True) -> np.ndarray:
     """
     Build distance matrix for all locations.
     
+    Re-optimizing the same waypoints (e.g. a dispatcher re-requesting a
+    route) reuses the matrix from an LRU cache keyed on the coordinates
+    rounded to COORD_DECIMALS, in order - the row order is the node order.
+    Routes above DISTANCE_CACHE_MAX_NODES points bypass the cache.
+    
     Args:
-        locations: List of Location objects
+        lats: Latitudes in degrees (see to_soa)
+        lngs: Longitudes in degrees (see to_soa)
         use_haversine: If True, use Haversine formula for accurate distances
     
     Returns:
-        NxN numpy array of distances
+        NxN float32 array of distances (km to ~1 m, half the cache
+        footprint of float64). Read-only: it may be shared with other
+        requests, so copy it before modifying
+    """
+    coords = np.round(np.stack((lats, lngs)).astype(np.float64, copy=False), COORD_DECIMALS)
+    if len(lats) > DISTANCE_CACHE_MAX_NODES:
+        adj_matrix = _compute_distance_matrix(coords[0], coords[1], use_haversine)
+        adj_matrix.setflags(write=False)  # Same contract as cached matrices
+        return adj_matrix
+    return _cached_distance_matrix(coords.tobytes(), use_haversine)
+
+# ============================================================================
+# LIN-KERNIGHAN LOCAL SEARCH (DEFAULT SOLVER)
+# ============================================================================
+
+LK_NEIGHBORS = 5  # Candidate edges per node: its nearest neighbors (as in LKH)
+
+def _nearest_neighbor_tour(adj_matrix: np.ndarray) -> np.ndarray:
     """
-    num_nodes = len(locations)
-    adj_matrix = np.zeros((num_nodes, num_nodes))
+    Greedy initial tour: start at node 0, always fly to the closest unvisited node.
+    """
+    num_nodes = len(adj_matrix)
+    tour = np.empty(num_nodes, dtype=np.int64)
+    visited = np.zeros(num_nodes, dtype=bool)
+    tour[0] = 0
+    visited[0] = True
     
-    for i in range(num_nodes):
-        for j in range(num_nodes):
-            if i == j:
-                continue
-            
-            if use_haversine:
-                dist = haversine_distance(
-                    locations[i].lat, locations[i].lng,
-                    locations[j].lat, locations[j].lng
-                )
-            else:
-                # Euclidean approximation (faster but less accurate)
-                dist = np.linalg.norm(
-                    np.array([locations[i].lat, locations[i].lng]) - 
-                    np.array([locations[j].lat, locations[j].lng])
-                )
-            
-            adj_matrix[i][j] = dist
+    for k in range(1, num_nodes):
+        row = np.where(visited, np.inf, adj_matrix[tour[k - 1]])
+        tour[k] = np.argmin(row)
+        visited[tour[k]] = True
     
-    return adj_matrix
+    return tour
+
+def _lin_kernighan_core(dist: np.ndarray, tour: np.ndarray, neighbors: np.ndarray) -> np.ndarray:
+    """
+    Improves a closed tour in place until no candidate move shortens it.
+    
+    Applies improving 2-opt moves (reverse a segment) and Or-opt moves
+    (relocate a 1-3 node segment, a restricted 3-opt), trying only each
+    node's candidate neighbors. Written as plain loops over preallocated
+    arrays so Numba can compile it in nopython mode; without Numba it runs
+    as ordinary Python. Gains are summed in float64 so float32 rounding
+    can't make two moves undo each other.
+    
+    Args:
+        dist: NxN float32 distance matrix (C-contiguous)
+        tour: int32 tour with node 0 first; modified in place
+        neighbors: NxK int32 candidate neighbors per node, closest first
+    
+    Returns:
+        The improved tour (same array), still starting at node 0
+    """
+    num_nodes = tour.shape[0]
+    num_candidates = neighbors.shape[1]
+    eps = 1e-7
+    position = np.empty(num_nodes, dtype=np.int32)
+    for k in range(num_nodes):
+        position[tour[k]] = k
+    buffer = np.empty(num_nodes, dtype=np.int32)
+    
+    improved = True
+    while improved:
+        improved = False
+        
+        # 2-opt: replace edges (a, b) and (c, d) with (a, c) and (b, d)
+        for i in range(num_nodes):
+            a = tour[i]
+            b = tour[(i + 1) % num_nodes]
+            for m in range(num_candidates):
+                c = neighbors[a, m]
+                gain = np.float64(dist[a, b]) - np.float64(dist[a, c])
+                if gain <= eps:
+                    break  # Neighbors are sorted, so no later c can help
+                j = position[c]
+                d = tour[(j + 1) % num_nodes]
+                if c == b or d == a:
+                    continue
+                if gain + np.float64(dist[c, d]) - np.float64(dist[b, d]) > eps:
+                    # Reversing the stretch between the two edges reconnects
+                    # them as (a, c) and (b, d); index 0 is never moved
+                    lo = min(i, j) + 1
+                    hi = max(i, j)
+                    while lo < hi:
+                        tour[lo], tour[hi] = tour[hi], tour[lo]
+                        position[tour[lo]] = lo
+                        position[tour[hi]] = hi
+                        lo += 1
+                        hi -= 1
+                    improved = True
+                    break
+        
+        # Or-opt: move segment tour[i:i + length] next to a neighbor of its head
+        for length in range(1, 4):
+            if length > num_nodes - 3:
+                break
+            i = 1
+            while i + length <= num_nodes:
+                first = tour[i]
+                last = tour[i + length - 1]
+                prev = tour[i - 1]
+                nxt = tour[(i + length) % num_nodes]
+                removal_gain = (np.float64(dist[prev, first]) + np.float64(dist[last, nxt])
+                                - np.float64(dist[prev, nxt]))
+                
+                best_delta = -eps
+                best_c = -1
+                best_reverse = False
+                for m in range(num_candidates):
+                    c = neighbors[first, m]
+                    pc = position[c]
+                    if i <= pc < i + length:
+                        continue
+                    # Neighbors of c once the segment is cut out of the tour
+                    after = tour[(pc + 1) % num_nodes]
+                    if after == first:
+                        after = nxt
+                    before = tour[(pc - 1 + num_nodes) % num_nodes]
+                    if before == last:
+                        before = prev
+                    # c, first..last, after
+                    delta = (np.float64(dist[c, first]) + np.float64(dist[last, after])
+                             - np.float64(dist[c, after]) - removal_gain)
+                    if delta < best_delta:
+                        best_delta = delta
+                        best_c = c
+                        best_reverse = False
+                    # before, last..first, c
+                    delta = (np.float64(dist[before, last]) + np.float64(dist[first, c])
+                             - np.float64(dist[before, c]) - removal_gain)
+                    if delta < best_delta:
+                        best_delta = delta
+                        best_c = c
+                        best_reverse = True
+                
+                if best_c >= 0:
+                    # Rebuild the tour with the segment at its new place
+                    k = 0
+                    for p in range(num_nodes):
+                        if i <= p < i + length:
+                            continue
+                        node = tour[p]
+                        if node == best_c and best_reverse:
+                            for q in range(i + length - 1, i - 1, -1):
+                                buffer[k] = tour[q]
+                                k += 1
+                        buffer[k] = node
+                        k += 1
+                        if node == best_c and not best_reverse:
+                            for q in range(i, i + length):
+                                buffer[k] = tour[q]
+                                k += 1
+                    # Rotate so node 0 stays at the front
+                    zero = 0
+                    while buffer[zero] != 0:
+                        zero += 1
+                    for p in range(num_nodes):
+                        tour[p] = buffer[(zero + p) % num_nodes]
+                        position[tour[p]] = p
+                    improved = True
+                i += 1
+    
+    return tour
+
+if NUMBA_AVAILABLE:
+    # The explicit signature makes Numba compile eagerly at import (and cache
+    # the machine code on disk), so the first route request pays no JIT cost
+    # dist is declared read-only so cached matrices pass without a copy.
+    # fastmath without "nnan"/"ninf": assuming no NaN/Inf lets LLVM fold the
+    # gain comparisons so that a non-finite distance loops forever
+    _lin_kernighan_core = njit(
+        types.int32[::1](
+            types.Array(types.float32, 2, "C", readonly=True), types.int32[::1], types.int32[:, ::1]
+        ),
+        fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+        cache=True
+    )(_lin_kernighan_core)
+
+def _lin_kernighan(adj_matrix: np.ndarray) -> np.ndarray:
+    """
+    Lin-Kernighan style local search over a closed tour.
+    
+    Starts from the nearest-neighbor tour and improves it with
+    _lin_kernighan_core, trying moves only along each node's LK_NEIGHBORS
+    nearest neighbors, which keeps every pass near O(n) instead of O(n^2).
+    
+    Args:
+        adj_matrix: NxN symmetric distance matrix
+    
+    Returns:
+        Visiting order of node indices, starting at node 0
+    """
+    num_nodes = len(adj_matrix)
+    tour = _nearest_neighbor_tour(adj_matrix).astype(np.int32)
+    if num_nodes < 4:
+        return tour  # Every closed tour of 3 or fewer nodes has the same length
+    
+    # Candidate set: each node's nearest neighbors, closest first
+    neighbors = np.argsort(adj_matrix + np.diag(np.full(num_nodes, np.inf)), axis=1)
+    neighbors = np.ascontiguousarray(neighbors[:, :min(LK_NEIGHBORS, num_nodes - 1)], dtype=np.int32)
+    dist = np.ascontiguousarray(adj_matrix, dtype=np.float32)
+    
+    return _lin_kernighan_core(dist, tour, neighbors)
+
+BRUTE_FORCE_MAX_TARGETS = 3  # Up to 3! = 6 tours: enumerate instead of searching
+
+def _brute_force_order(adj_matrix: np.ndarray) -> np.ndarray:
+    """
+    Exact closed tour for tiny instances by scoring every visiting order.
+    
+    Returns:
+        Shortest visiting order of node indices, starting at node 0
+    """
+    num_nodes = len(adj_matrix)
+    tours = np.array(
+        [(0,) + order for order in itertools.permutations(range(1, num_nodes))],
+        dtype=np.int64
+    )
+    # Closed tour length of every candidate at once
+    lengths = adj_matrix[tours, np.roll(tours, -1, axis=1)].sum(axis=1)
+    return tours[np.argmin(lengths)]
 
 # ============================================================================
 # QUBO OPTIMIZATION ENGINE
 # ============================================================================
 
-def solve_tsp_qubo(start: Location, targets: List[Location]) -> List[dict]:
+# The QUBO has (targets + 1)^2 binary variables and the exact eigensolver
+# works on a 2^variables state space: 4 targets is already 25 variables,
+# beyond that it hangs or runs out of memory instead of failing cleanly
+QUBO_MAX_TARGETS = 4
+
+def _tsp_quadratic_program(adj_matrix: np.ndarray) -> "QuadraticProgram":
+    """
+    Builds the TSP quadratic program directly from the distance matrix.
+    
+    Same formulation as qiskit_optimization's Tsp application, without
+    first converting the dense matrix into a NetworkX graph: binary
+    x[i, p] = "node i is visited at step p" (variable index i*n + p),
+    minimize sum of w[i, j] * x[i, p] * x[j, p+1], with each node visited
+    once and each step holding one node.
     """
-    Solves the Traveling Salesperson Problem using QUBO formulation.
+    num_nodes = len(adj_matrix)
+    qp = QuadraticProgram("TSP")
+    for i in range(num_nodes):
+        for p in range(num_nodes):
+            qp.binary_var(name=f"x_{i}_{p}")
     
-    Current Implementation: Classical Exact Solver (NumPy) for stability
-    Future Upgrade Path: Replace with QAOA or D-Wave Sampler for real quantum
+    # Accumulate on the upper triangle so (u, v) and (v, u) terms merge
+    quadratic = {}
+    rows, cols = np.nonzero(adj_matrix)
+    for i, j, weight in zip(rows.tolist(), cols.tolist(), adj_matrix[rows, cols].tolist()):
+        for p in range(num_nodes):
+            u, v = i * num_nodes + p, j * num_nodes + (p + 1) % num_nodes
+            key = (min(u, v), max(u, v))
+            quadratic[key] = quadratic.get(key, 0.0) + weight
+    qp.minimize(quadratic=quadratic)
+    
+    for i in range(num_nodes):
+        qp.linear_constraint(
+            linear={i * num_nodes + p: 1 for p in range(num_nodes)}, sense="==", rhs=1, name=f"node_{i}"
+        )
+    for p in range(num_nodes):
+        qp.linear_constraint(
+            linear={i * num_nodes + p: 1 for i in range(num_nodes)}, sense="==", rhs=1, name=f"step_{p}"
+        )
+    
+    return qp
+
+def _interpret_tsp_solution(x: np.ndarray, num_nodes: int) -> np.ndarray:
+    """
+    Decodes a solution of _tsp_quadratic_program into a visiting order.
+    
+    Raises:
+        ValueError: If the assignment is not a permutation (infeasible)
+    """
+    assignment = np.asarray(x).reshape(num_nodes, num_nodes) > 0.5  # [node, step]
+    if not (assignment.sum(axis=0) == 1).all() or not (assignment.sum(axis=1) == 1).all():
+        raise ValueError("QUBO solution is not a valid tour")
+    return np.argmax(assignment, axis=0)
+
+def _build_tsp_inputs(start: Location, targets: List[Location]):
+    """
+    Prepares the solver inputs for [start, *targets].
+    
+    Returns:
+        (all_points, lats, lngs, adj_matrix): the locations in node order,
+        their coordinates (see to_soa) and the Haversine distance matrix
+    
+    Raises:
+        ValueError: If any coordinate is NaN or infinite
+    """
+    # 1. Prepare all locations [Start, Target1, Target2, ...]
+    all_points = [start] + targets
+    
+    # 2. Build distance matrix using Haversine for accuracy; the
+    # Location objects are only indexed again to build the response
+    lats, lngs = to_soa(all_points)
+    if not (np.isfinite(lats).all() and np.isfinite(lngs).all()):
+        raise ValueError("Location coordinates must be finite numbers")
+    adj_matrix = build_distance_matrix(lats, lngs, use_haversine=True)
+    logger.info(f"Distance matrix shape: {adj_matrix.shape}")
+    
+    return all_points, lats, lngs, adj_matrix
+
+def _solve_qubo(adj_matrix: np.ndarray) -> np.ndarray:
+    """
+    Solves the TSP over adj_matrix through the Qiskit QUBO pipeline.
+    
+    Returns:
+        Visiting order of node indices
+    
+    Raises:
+        ValueError: If the solver returns an infeasible assignment; Qiskit
+            errors are propagated as-is
+    """
+    # 3. Create TSP problem instance straight from the matrix
+    qp = _tsp_quadratic_program(adj_matrix)
+    
+    # 4. Convert to QUBO (Quadratic Unconstrained Binary Optimization)
+    qubo = QUBO_CONVERTER.convert(qp)
+    
+    # 5. Solve using Classical Simulator
+    # NOTE: For real quantum hardware, replace with:
+    #   - QAOA (Quantum Approximate Optimization Algorithm)
+    #   - VQE (Variational Quantum Eigensolver)
+    #   - D-Wave Sampler (for quantum annealing)
+    result = QUBO_SOLVER.solve(qubo)
+    
+    # 6. Interpret solution
+    return _interpret_tsp_solution(result.x, len(adj_matrix))
+
+def solve_tsp_qubo(start: Location, targets: List[Location], use_qubo: bool = False) -> List[dict]:
+    """
+    Solves the Traveling Salesperson Problem for the drone's delivery route.
+    
+    Default: Lin-Kernighan local search on the distance matrix - near-optimal
+    tours in milliseconds for tens of waypoints.
+    Optional (use_qubo=True): QUBO formulation solved exactly by the classical
+    NumPy eigensolver. Its cost grows exponentially with the number of
+    targets, so above QUBO_MAX_TARGETS Lin-Kernighan is used instead; it is
+    kept as the upgrade path to QAOA / D-Wave.
     
     Args:
         start: Current drone location
         targets: List of delivery target locations
+        use_qubo: Solve via the Qiskit QUBO pipeline instead of Lin-Kernighan
     
     Returns:
         Optimized path as list of waypoint dictionaries
     """
-    if not OPTIMIZER_AVAILABLE:
-        logger.warning("Optimization libraries not found. Returning sequential order.")
-        return _fallback_sequential_route(start, targets)
-
     if len(targets) == 0:
         return [{"lat": start.lat, "lng": start.lng, "id": start.id, "sequence_order": 0}]
     
-    logger.info(f"Starting QUBO optimization for {len(targets)} targets...")
+    all_points, lats, lngs, adj_matrix = _build_tsp_inputs(start, targets)
     
-    try:
-        # 1. Prepare all locations [Start, Target1, Target2, ...]
-        all_points = [start] + targets
-        num_nodes = len(all_points)
-        
-        # 2. Build distance matrix using Haversine for accuracy
-        adj_matrix = build_distance_matrix(all_points, use_haversine=True)
-        logger.info(f"Distance matrix shape: {adj_matrix.shape}")
-        
-        # 3. Create TSP problem instance using NetworkX graph
-        graph = nx.from_numpy_array(adj_matrix)
-        tsp_prob = Tsp(graph)
-        qp = tsp_prob.to_quadratic_program()
-        
-        # 4. Convert to QUBO (Quadratic Unconstrained Binary Optimization)
-        qubo_converter = QuadraticProgramToQubo()
-        qubo = qubo_converter.convert(qp)
-        
-        # 5. Solve using Classical Simulator
-        # NOTE: For real quantum hardware, replace with:
-        #   - QAOA (Quantum Approximate Optimization Algorithm)
-        #   - VQE (Variational Quantum Eigensolver)
-        #   - D-Wave Sampler (for quantum annealing)
-        solver = MinimumEigenOptimizer(NumPyMinimumEigensolver())
-        result = solver.solve(qubo)
-        
-        # 6. Interpret solution
-        order_indices = tsp_prob.interpret(result)
-        logger.info(f"Raw solution order: {order_indices}")
-        
-        # 7. Ensure route starts at current location (index 0)
-        start_index_in_solution = list(order_indices).index(0)
-        rotated_indices = np.roll(order_indices, -start_index_in_solution)
-        
-        # 8. Build optimized path
-        optimized_path = []
-        for seq_num, idx in enumerate(rotated_indices):
-            point = all_points[idx]
-            optimized_path.append({
-                "lat": point.lat,
-                "lng": point.lng,
-                "id": point.id if hasattr(point, 'id') else f"waypoint_{seq_num}",
-                "sequence_order": seq_num
-            })
-        
-        total_distance = result.fval
-        logger.info(f"✅ Optimization complete. Total path distance: {total_distance:.2f} km")
-        
-        return optimized_path
-        
-    except Exception as e:
-        logger.error(f"QUBO optimization failed: {e}")
-        logger.warning("Falling back to sequential route")
-        return _fallback_sequential_route(start, targets)
-
-def _fallback_sequential_route(start: Location, targets: List[Location]) -> List[dict]:
-    """
-    Fallback method: Returns sequential route without optimization.
-    Used when QUBO solver is unavailable.
-    """
-    path = [{"lat": start.lat, "lng": start.lng, "id": start.id, "sequence_order": 0}]
+    order_indices = None
+    if len(targets) <= BRUTE_FORCE_MAX_TARGETS:
+        # At most 3! = 6 orders: enumerate them exactly, no solver needed
+        order_indices = _brute_force_order(adj_matrix)
+    elif use_qubo and not OPTIMIZER_AVAILABLE:
+        logger.warning("Qiskit optimization not available. Using Lin-Kernighan instead.")
+    elif use_qubo and len(targets) > QUBO_MAX_TARGETS:
+        logger.warning(
+            f"{len(targets)} targets exceed QUBO_MAX_TARGETS={QUBO_MAX_TARGETS}. Using Lin-Kernighan instead."
+        )
+    elif use_qubo:
+        logger.info(f"Starting QUBO optimization for {len(targets)} targets...")
+        try:
+            order_indices = _solve_qubo(adj_matrix)
+        except Exception as e:
+            logger.error(f"QUBO optimization failed, falling back to Lin-Kernighan: {e}", exc_info=True)
+    
+    if order_indices is None:
+        order_indices = _lin_kernighan(adj_matrix)
+    logger.info(f"Raw solution order: {order_indices}")
     
-    for i, target in enumerate(targets):
-        path.append({
-            "lat": target.lat,
-            "lng": target.lng,
-            "id": target.id if hasattr(target, 'id') else f"target_{i}",
-            "sequence_order": i + 1
-        })
+    # 7. Ensure route starts at current location (index 0): read the tour
+    # from there with wrap-around indexing instead of copying it rotated
+    start_index_in_solution = int(np.argmax(order_indices == 0))
+    order = order_indices.tolist()
+    num_nodes = len(order)
     
-    return path
+    # 8. Build optimized path
+    ids = [getattr(point, 'id', None) for point in all_points]
+    optimized_path = [
+        {
+            "lat": float(lats[idx]),
+            "lng": float(lngs[idx]),
+            "id": ids[idx] or f"waypoint_{seq_num}",
+            "sequence_order": seq_num
+        }
+        for seq_num in range(num_nodes)
+        for idx in (order[(start_index_in_solution + seq_num) % num_nodes],)
+    ]
+    
+    # Open path = closed tour minus the edge that leads back into the start
+    closed_distance = (adj_matrix[order_indices[:-1], order_indices[1:]].sum()
+                       + adj_matrix[order[-1], order[0]])
+    total_distance = closed_distance - adj_matrix[order[start_index_in_solution - 1], 0]
+    logger.info(f"✅ Optimization complete. Total path distance: {total_distance:.2f} km")
+    
+    return optimized_path
 
 # ============================================================================
 # ROUTE METRICS
@@ -226,13 +639,11 @@ def calculate_route_metrics(route: List[dict]) -> dict:
     if len(route) < 2:
         return {"total_distance_km": 0, "segments": 0}
     
-    total_distance = 0
-    for i in range(len(route) - 1):
-        dist = haversine_distance(
-            route[i]["lat"], route[i]["lng"],
-            route[i+1]["lat"], route[i+1]["lng"]
-        )
-        total_distance += dist
+    # All segments in one vectorized pass: point i to point i+1
+    count = len(route)
+    lats = np.fromiter((waypoint["lat"] for waypoint in route), dtype=np.float64, count=count)
+    lngs = np.fromiter((waypoint["lng"] for waypoint in route), dtype=np.float64, count=count)
+    total_distance = float(haversine_vector(lats[:-1], lngs[:-1], lats[1:], lngs[1:]).sum())
     
     return {
         "total_distance_km": round(total_distance, 2),